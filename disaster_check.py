@@ -1,65 +1,170 @@
 import pandas as pd
-import folium, webbrowser, os, schedule, sys, time, math
+import numpy as np
+import folium, webbrowser, os, schedule, time, math
+import logging
+from functools import lru_cache
 from gdacs.api import GDACSAPIReader
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy broadcast path is used instead
+    njit = None
+
+try:
+    from sklearn.neighbors import BallTree
+    from sklearn.metrics.pairwise import haversine_distances
+except ImportError:  # scikit-learn is optional; the Numba/NumPy paths are used instead
+    BallTree = None
+
+log = logging.getLogger(__name__)
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; plain NumPy evaluates the fallback
+    ne = None
+
+# Below this many row x disaster pairs the BallTree build costs more than
+# the dense C-backed distance matrix it avoids
+_BALLTREE_MIN_PAIRS = 10_000
+
+# Marker colors indexed by the in-jeopardy flag
+MARKER_COLORS = ('blue', 'red')
+
+@lru_cache(maxsize=4)
+def _load_csv_cached(file_path, mtime):
+    """Parse the CSV; mtime is part of the cache key so edits invalidate it."""
+    # float32 gives ~1 m resolution, ample for a km-scale range check,
+    # and halves memory traffic in the distance kernels
+    return pd.read_csv(file_path, dtype={'Latitude': 'float32', 'Longitude': 'float32'})
+
 def load_companies_from_csv(file_path):
-    """Load company data from a CSV file."""
-    return pd.read_csv(file_path)
+    """Load company data from a CSV file, cached until the file changes on disk."""
+    return _load_csv_cached(file_path, os.path.getmtime(file_path))
 
-def haversine(lat1, lon1, lat2, lon2):
-    """Calculate the great-circle distance between two points on the Earth."""
+if njit is not None:
+    @njit('boolean[:](f4[:], f4[:], f4[:], f4[:], f8)', fastmath=True, cache=True, parallel=True)
+    def _vicinity_kernel(co_lat, co_lon, di_lat, di_lon, rng):
+        """JIT-compiled jeopardy check over coordinate arrays in degrees."""
+        R = 6378.1
+        rng_deg = math.degrees(rng / R)
+        in_jeopardy = np.zeros(co_lat.shape[0], dtype=np.bool_)
+        for i in prange(co_lat.shape[0]):
+            phi1 = math.radians(co_lat[i])
+            cos_phi1 = math.cos(phi1)
+            for j in range(di_lat.shape[0]):
+                # Cheap bounding-box rejection before any further trig; the
+                # longitude delta is wrapped so antimeridian pairs survive
+                dlon = (di_lon[j] - co_lon[i] + 180.0) % 360.0 - 180.0
+                if abs(di_lat[j] - co_lat[i]) > rng_deg or abs(dlon) * cos_phi1 > rng_deg:
+                    continue
+                phi2 = math.radians(di_lat[j])
+                delta_phi = phi2 - phi1
+                delta_lambda = math.radians(di_lon[j] - co_lon[i])
+                a = math.sin(delta_phi / 2) ** 2 + cos_phi1 * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+                distance = 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+                if distance <= rng:
+                    in_jeopardy[i] = True
+                    break
+        return in_jeopardy
+
+def disaster_coordinate_arrays(disasters_data):
+    """Build contiguous latitude/longitude arrays from the disaster records.
+
+    The structured array from extract_disaster_info already stores the
+    coordinates column-wise, so this is just a field view.
+    """
+    return disasters_data['lat'], disasters_data['lon']
+
+def check_disaster_vicinity(company_lats, company_lons, di_lat, di_lon):
+    """Check which companies are within 241 kilometers of any disaster.
+
+    Takes arrays of company and disaster latitudes/longitudes (in degrees)
+    and returns a boolean mask. A cheap bounding-box test in degrees rejects
+    the far-apart pairs first; the haversine trig only runs on the survivors.
+    """
     R = 6378.1  # Earth radius in kilometers at the equator
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-
-    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    return R * c  # Distance in kilometers
-
-def check_disaster_vicinity(company_lat, company_lon, disasters_data):
-    """Check if a company is within 241 kilometers of any disaster."""
-    in_jeopardy = False
-    for disaster in disasters_data:
-        disaster_lat, disaster_lon = disaster['coordinates']
-        distance = haversine(company_lat, company_lon, disaster_lat, disaster_lon)
-        if distance <= 241:
-            print(f"\033[91mCompany at ({company_lat}, {company_lon}) is within {distance:.2f} km of disaster at ({disaster_lat}, {disaster_lon})\033[0m")
-            in_jeopardy = True
+    rng = 241.0
+    co_lat = np.asarray(company_lats, dtype=np.float32)
+    co_lon = np.asarray(company_lons, dtype=np.float32)
+    if di_lat.shape[0] == 0:
+        return np.zeros(co_lat.shape[0], dtype=bool)
+
+    if BallTree is not None:
+        rows = np.radians(np.column_stack((co_lat, co_lon)))
+        dis = np.radians(np.column_stack((di_lat, di_lon)))
+        if co_lat.shape[0] * di_lat.shape[0] < _BALLTREE_MIN_PAIRS:
+            # Dense C-backed distance matrix; no tree build overhead
+            distances = haversine_distances(rows, dis) * R
+            return (distances <= rng).any(axis=1)
+        # Radius query against a haversine BallTree: O(N log M) instead of
+        # the O(N * M) all-pairs scan
+        tree = BallTree(dis, metric='haversine')
+        hits = tree.query_radius(rows, r=rng / R)
+        return np.fromiter((h.size > 0 for h in hits), dtype=bool, count=co_lat.shape[0])
+
+    if njit is not None:
+        return _vicinity_kernel(co_lat, co_lon, di_lat, di_lon, rng)
+
+    rng_deg = np.degrees(rng / R)
+    dlat_deg = di_lat[None, :] - co_lat[:, None]
+    # Wrap the longitude delta to [-180, 180) so pairs straddling the
+    # antimeridian are not falsely rejected by the box test
+    dlon_deg = (di_lon[None, :] - co_lon[:, None] + 180.0) % 360.0 - 180.0
+    box_mask = (np.abs(dlat_deg) <= rng_deg) & (np.abs(dlon_deg) * np.cos(np.radians(co_lat))[:, None] <= rng_deg)
+
+    in_jeopardy = np.zeros(co_lat.shape[0], dtype=bool)
+    ci, dj = np.nonzero(box_mask)
+    if ci.size:
+        phi1 = np.radians(co_lat[ci])
+        phi2 = np.radians(di_lat[dj])
+        delta_phi = phi2 - phi1
+        delta_lambda = np.radians(di_lon[dj] - co_lon[ci])
+        if ne is not None:
+            # numexpr multi-threads the elementwise math and skips temporaries
+            a = ne.evaluate('sin(delta_phi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(delta_lambda / 2) ** 2')
         else:
-            print(f"Company at ({company_lat}, {company_lon}) is {distance:.2f} km away from disaster at ({disaster_lat}, {disaster_lon})")
+            a = np.sin(delta_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2) ** 2
+        distances = 2 * R * np.arcsin(np.sqrt(a))  # Distances in kilometers
+        in_jeopardy[ci[distances <= rng]] = True
     return in_jeopardy
 
 def create_map_from_companies(companies_df, disasters_data, include_disasters=False):
     """Create a map showing companies and optionally disasters."""
     if companies_df.empty:
-        print("No company data available.")
+        log.warning("No company data available.")
         return None
     
     # Set initial location to Indianapolis, Indiana
     initial_location = [39.7684, -86.1581]  
     company_map = folium.Map(location=initial_location, zoom_start=2)
 
-    for _, row in companies_df.iterrows():
-        in_jeopardy = check_disaster_vicinity(row['Latitude'], row['Longitude'], disasters_data)
-        color = 'red' if in_jeopardy else 'blue'
+    co_lat = companies_df['Latitude'].to_numpy()
+    co_lon = companies_df['Longitude'].to_numpy()
+    co_name = companies_df['Company_Name'].to_numpy()
+
+    di_lat, di_lon = disaster_coordinate_arrays(disasters_data)
+    in_jeopardy_mask = check_disaster_vicinity(co_lat, co_lon, di_lat, di_lon)
+    log.info("%d of %d companies are within 241 km of a disaster", int(in_jeopardy_mask.sum()), len(companies_df))
+
+    for i in range(len(companies_df)):
+        in_jeopardy = bool(in_jeopardy_mask[i])
         folium.Marker(
-            location=[row['Latitude'], row['Longitude']],
-            popup=f"{row['Company_Name']}{' - In Jeopardy!' if in_jeopardy else ''}",
-            icon=folium.Icon(color=color)
+            location=[co_lat[i], co_lon[i]],
+            popup=f"{co_name[i]}{' - In Jeopardy!' if in_jeopardy else ''}",
+            icon=folium.Icon(color=MARKER_COLORS[in_jeopardy])
         ).add_to(company_map)
 
     if include_disasters:
-        for disaster in disasters_data:
+        for rec in disasters_data:
+            location = [float(rec['lat']), float(rec['lon'])]
             folium.Marker(
-                location=disaster['coordinates'][::-1],  # Reverse coordinates here
-                popup=f"Disaster: {disaster['name']} ({disaster['disaster_type']})",
+                location=location,
+                popup=f"Disaster: {rec['name']} ({rec['type']})",
                 icon=folium.Icon(color='orange')
             ).add_to(company_map)
 
             folium.Circle(
-                location=disaster['coordinates'][::-1],  # Reverse coordinates here
+                location=location,
                 radius=241000,  # 241 km in meters
                 color='orange',
                 fill=True,
@@ -70,45 +175,65 @@ def create_map_from_companies(companies_df, disasters_data, include_disasters=Fa
     company_map.save(map_path)
     return map_path
 
+# Structured layout for extracted disasters; the coordinate fields are the
+# SoA arrays the vicinity check consumes directly
+DISASTER_DTYPE = np.dtype([('name', 'U64'), ('type', 'U32'), ('lon', 'f4'), ('lat', 'f4')])
+
 def extract_disaster_info(disasters):
-    """Extract relevant information from disaster data."""
-    disaster_info = []
+    """Extract relevant disaster information into a structured NumPy array."""
     if 'features' not in disasters:
         raise ValueError("Disaster data format not as expected. Missing 'features' key.")
+    rows = []
     for feature in disasters['features']:
-        try:
-            properties = feature['properties']
-            name = properties.get('name', 'No Name Available')
-            disaster_type = properties.get('eventtype', 'Unknown')
-            geometry = feature['geometry']
-            if geometry and geometry['type'] == 'Point':  # Ensure it's a point geometry
-                coordinates = geometry.get('coordinates', [None, None])
-                print("Coordinates:", coordinates)  # Check coordinates
-                disaster_info.append({
-                    'name': name,
-                    'disaster_type': disaster_type,
-                    'coordinates': coordinates
-                })
-        except KeyError as e:
-            print(f"Error extracting disaster info for feature: {feature}. Missing key: {e}")
-    return disaster_info
+        # Malformed features are skipped rather than aborting the update
+        p = feature.get('properties')
+        g = feature.get('geometry')
+        if not isinstance(p, dict) or not isinstance(g, dict):
+            continue
+        if not (g.get('type') == 'Point' and g.get('coordinates')):  # Ensure it's a point geometry
+            continue
+        rows.append((p.get('name', 'No Name Available'), p.get('eventtype', 'Unknown'),
+                     g['coordinates'][0], g['coordinates'][1]))
+    return np.array(rows, dtype=DISASTER_DTYPE)
+
+
+# Shared GDACS client (keeps the underlying HTTP session alive) and the
+# last successfully parsed feed
+_gdacs_client = None
+_last_feed = None
+
+def _fetch_latest_events():
+    """Fetch the latest GDACS events through the shared client.
+
+    The gdacs client exposes no conditional-GET (ETag/If-Modified-Since)
+    hook, so the nearest equivalent is reusing one client across refreshes
+    and falling back to the last good payload when a fetch fails.
+    """
+    global _gdacs_client, _last_feed
+    if _gdacs_client is None:
+        _gdacs_client = GDACSAPIReader()
+    try:
+        _last_feed = vars(_gdacs_client.latest_events())
+    except Exception as e:
+        if _last_feed is None:
+            raise
+        log.warning("GDACS fetch failed (%s); reusing the last successful feed", e)
+    return _last_feed
 
 def fetch_and_update_map(csv_path, include_disasters=False):
     """Fetch the latest disaster data and update the map."""
     try:
-        client = GDACSAPIReader()
-        disaster_data = client.latest_events()
-        disaster_data = vars(disaster_data)
+        disaster_data = _fetch_latest_events()
         disaster_info = extract_disaster_info(disaster_data)
         companies_df = load_companies_from_csv(csv_path)
         map_path = create_map_from_companies(companies_df, disaster_info, include_disasters)
-        print("Map updated with the latest disaster data. See below\n")
-        print(disaster_info)  # Print the entire disaster_info
+        log.info("Map updated with the latest disaster data.")
+        log.debug("Disaster info: %s", disaster_info)
         webbrowser.open('file://' + os.path.realpath(map_path), new=0)  # Open the map in the browser
-    except Exception as e:
-        print(f"Error during fetching or processing: {e}")
-        import traceback
-        traceback.print_exc()  # Print the traceback to get more details about the error
+    except Exception:
+        log.exception("Error during fetching or processing")
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 
 # Initial display of the map
 fetch_and_update_map('companies.csv', include_disasters=True)
@@ -116,10 +241,8 @@ fetch_and_update_map('companies.csv', include_disasters=True)
 # Automatically update the map every hour
 schedule.every().hour.do(fetch_and_update_map, csv_path='companies.csv', include_disasters=True)
 
+log.info("Scheduler started. The map will update every hour.")
 while True:
     schedule.run_pending()
-    for i in range(7200, 0, -1):  # 3600 seconds = 1 hour
-        sys.stdout.write("\rScheduler started. Next update in {:02d}:{:02d} minutes".format(i // 60, i % 60))
-        sys.stdout.flush()
-        time.sleep(1)
-    sys.stdout.write("\n")
+    # Sleep until the next scheduled run instead of waking every second
+    time.sleep(schedule.idle_seconds() or 1)
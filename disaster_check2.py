@@ -1,276 +1,503 @@
 import pandas as pd
+import numpy as np
 import folium
 import webbrowser
 import os
-import math
 import time
 import json
 from gdacs.api import GDACSAPIReader
 import threading
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from urllib.parse import parse_qs
 import signal
+import math
+import hashlib
+import logging
+from functools import lru_cache
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy broadcast path is used instead
+    njit = None
+
+try:
+    from sklearn.neighbors import BallTree
+    from sklearn.metrics.pairwise import haversine_distances
+except ImportError:  # scikit-learn is optional; the Numba/NumPy paths are used instead
+    BallTree = None
+
+log = logging.getLogger(__name__)
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; plain NumPy evaluates the fallback
+    ne = None
+
+# Below this many row x disaster pairs the BallTree build costs more than
+# the dense C-backed distance matrix it avoids
+_BALLTREE_MIN_PAIRS = 10_000
+
+# Static HTML fragments for the map shell. Assembled once per process;
+# refreshes only swap the marker layer instead of re-rendering these.
+PULSATING_CSS = """
+<style>
+@keyframes pulse {
+    0% {
+        stroke-opacity: 0.8;
+        stroke-width: 1;
+    }
+    50% {
+        stroke-opacity: 0.3;
+        stroke-width: 3;
+    }
+    100% {
+        stroke-opacity: 0.8;
+        stroke-width: 1;
+    }
+}
+.pulsating-circle {
+    animation: pulse 2s ease-in-out infinite;
+}
+</style>
+"""
+
+# Dynamic settings (refresh interval, disaster range) live in settings.js,
+# served by the local HTTP server, so changing them never re-renders the map shell
+SETTINGS_JS_TAG = '<script src="http://localhost:8000/settings.js"></script>'
+
+# Leaflet.markercluster plugin used by the batched marker emission
+MARKERCLUSTER_ASSETS = """
+<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.5.3/MarkerCluster.css"/>
+<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.5.3/MarkerCluster.Default.css"/>
+<script src="https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.5.3/leaflet.markercluster.js"></script>
+"""
+
+CONTROL_PANEL_HTML = """
+<div id="control-panel" style="position: absolute; top: 10px; right: 10px; z-index: 1000; background: rgba(255, 255, 255, 0.7); padding: 10px; border-radius: 5px;">
+    <label for="refresh-rate">Refresh Rate:</label>
+    <select id="refresh-rate">
+        <option value="600">10 minutes</option>
+        <option value="3600" selected>1 hour</option>
+        <option value="21600">6 hours</option>
+        <option value="43200">12 hours</option>
+        <option value="86400">24 hours</option>
+    </select>
+    <br><br>
+    <label for="disaster-range">Disaster Range (km):</label>
+    <select id="disaster-range">
+        <option value="241" selected>241 (Default)</option>
+        <option value="300">300</option>
+        <option value="400">400</option>
+        <option value="500">500</option>
+        <option value="600">600</option>
+        <option value="700">700</option>
+        <option value="800">800</option>
+        <option value="900">900</option>
+        <option value="1000">1000</option>
+    </select>
+</div>
+<div id="progress-bar-container" style="position: fixed; bottom: 15px; left: 0; width: 100%; height: 10px; background-color: rgba(0, 0, 0, 0.1); z-index: 1000;">
+    <div id="progress-bar" style="width: 0%; height: 100%; background-color: rgba(0, 255, 0, 0.5);"></div>
+</div>
+"""
+
+REFRESH_SCRIPT = """
+<script>
+var refreshInterval;
+var progressInterval;
+var startTime;
+var duration;
+
+function updateProgressBar() {
+    var currentTime = new Date().getTime();
+    var elapsedTime = currentTime - startTime;
+    var progress = (elapsedTime / duration) * 100;
+    document.getElementById('progress-bar').style.width = progress + '%';
+
+    if (progress >= 100) {
+        clearInterval(progressInterval);
+    }
+}
+
+function setRefreshInterval() {
+    clearInterval(refreshInterval);
+    clearInterval(progressInterval);
+
+    var refreshRate = document.getElementById('refresh-rate').value;
+    duration = refreshRate * 1000;
+    startTime = new Date().getTime();
+
+    // Update the refresh_config.json file
+    fetch('http://localhost:8000/update_refresh_rate?interval=' + refreshRate)
+        .then(response => response.text())
+        .then(data => console.log(data))
+        .catch(error => console.error('Error:', error));
+
+    refreshInterval = setInterval(function() {
+        location.reload();
+    }, duration);
+
+    progressInterval = setInterval(updateProgressBar, 1000); // Update progress every second
+    updateProgressBar(); // Initial update
+}
+
+function updateDisasterRange() {
+    var disasterRange = document.getElementById('disaster-range').value;
+    fetch('http://localhost:8000/update_disaster_range?range=' + disasterRange)
+        .then(response => response.text())
+        .then(data => {
+            console.log(data);
+            location.reload();  // Reload the page to reflect the changes
+        })
+        .catch(error => console.error('Error:', error));
+}
+
+function sendHeartbeat() {
+    fetch('http://localhost:8000/heartbeat')
+        .then(response => response.text())
+        .catch(error => console.error('Error:', error));
+}
+
+// Send heartbeat every 5 seconds
+setInterval(sendHeartbeat, 5000);
+
+document.getElementById('refresh-rate').addEventListener('change', setRefreshInterval);
+document.getElementById('disaster-range').addEventListener('change', updateDisasterRange);
+setRefreshInterval();
+</script>
+"""
+
+# Pre-rendered Leaflet icon options; declared once in the marker JS and
+# reused by reference instead of instantiated per marker
+ICON_BLUE_JS = "L.AwesomeMarkers.icon({icon: 'info-sign', markerColor: 'blue', prefix: 'glyphicon'})"
+ICON_RED_JS = "L.AwesomeMarkers.icon({icon: 'info-sign', markerColor: 'red', prefix: 'glyphicon'})"
+
+@lru_cache(maxsize=4)
+def _load_csv_cached(file_path, mtime):
+    """Parse the CSV; mtime is part of the cache key so edits invalidate it."""
+    # float32 gives ~1 m resolution, ample for a km-scale range check,
+    # and halves memory traffic in the distance kernels
+    return pd.read_csv(file_path, dtype={'Latitude': 'float32', 'Longitude': 'float32'})
 
 def load_locations_from_csv(file_path):
-    """Load location data from a CSV file."""
-    return pd.read_csv(file_path)
+    """Load location data from a CSV file, cached until the file changes on disk."""
+    return _load_csv_cached(file_path, os.path.getmtime(file_path))
+
+if njit is not None:
+    @njit('boolean[:](f4[:], f4[:], f4[:], f4[:], f8)', fastmath=True, cache=True, parallel=True)
+    def _vicinity_kernel(lo_lat, lo_lon, di_lat, di_lon, rng):
+        """JIT-compiled jeopardy check over coordinate arrays in degrees."""
+        R = 6378.1
+        rng_deg = math.degrees(rng / R)
+        in_jeopardy = np.zeros(lo_lat.shape[0], dtype=np.bool_)
+        for i in prange(lo_lat.shape[0]):
+            phi1 = math.radians(lo_lat[i])
+            cos_phi1 = math.cos(phi1)
+            for j in range(di_lat.shape[0]):
+                # Cheap bounding-box rejection before any further trig; the
+                # longitude delta is wrapped so antimeridian pairs survive
+                dlon = (di_lon[j] - lo_lon[i] + 180.0) % 360.0 - 180.0
+                if abs(di_lat[j] - lo_lat[i]) > rng_deg or abs(dlon) * cos_phi1 > rng_deg:
+                    continue
+                phi2 = math.radians(di_lat[j])
+                delta_phi = phi2 - phi1
+                delta_lambda = math.radians(di_lon[j] - lo_lon[i])
+                a = math.sin(delta_phi / 2) ** 2 + cos_phi1 * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+                distance = 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+                if distance <= rng:
+                    in_jeopardy[i] = True
+                    break
+        return in_jeopardy
+
+def disaster_coordinate_arrays(disasters_data):
+    """Build contiguous latitude/longitude arrays from the disaster records.
+
+    The structured array from extract_disaster_info already stores the
+    coordinates column-wise, so this is just a field view.
+    """
+    return disasters_data['lat'], disasters_data['lon']
+
+def check_disaster_vicinity(location_lats, location_lons, di_lat, di_lon, disaster_range):
+    """Check which locations are within the specified range of any disaster.
 
-def haversine(lat1, lon1, lat2, lon2):
-    """Calculate the great-circle distance between two points on the Earth."""
+    Takes arrays of location and disaster latitudes/longitudes (in degrees)
+    and returns a boolean mask. A cheap bounding-box test in degrees rejects
+    the far-apart pairs first; the haversine trig only runs on the survivors.
+    """
     R = 6378.1  # Earth radius in kilometers at the equator
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-
-    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    return R * c  # Distance in kilometers
-
-def check_disaster_vicinity(company_lat, company_lon, disasters_data, disaster_range):
-    """Check if a company is within the specified range of any disaster."""
-    for disaster in disasters_data:
-        disaster_lat, disaster_lon = disaster['coordinates']
-        distance = haversine(company_lat, company_lon, disaster_lat, disaster_lon)
-        print(f"Checking location ({company_lat}, {company_lon}) against disaster at ({disaster_lat}, {disaster_lon}). Distance: {distance:.2f} km, Range: {disaster_range} km")
-        if distance <= disaster_range:
-            print(f"Location in jeopardy! Distance: {distance:.2f} km, Range: {disaster_range} km")
-            return True
-    return False
+    rng = float(disaster_range)
+    lo_lat = np.asarray(location_lats, dtype=np.float32)
+    lo_lon = np.asarray(location_lons, dtype=np.float32)
+    if di_lat.shape[0] == 0:
+        return np.zeros(lo_lat.shape[0], dtype=bool)
+
+    if BallTree is not None:
+        rows = np.radians(np.column_stack((lo_lat, lo_lon)))
+        dis = np.radians(np.column_stack((di_lat, di_lon)))
+        if lo_lat.shape[0] * di_lat.shape[0] < _BALLTREE_MIN_PAIRS:
+            # Dense C-backed distance matrix; no tree build overhead
+            distances = haversine_distances(rows, dis) * R
+            return (distances <= rng).any(axis=1)
+        # Radius query against a haversine BallTree: O(N log M) instead of
+        # the O(N * M) all-pairs scan
+        tree = BallTree(dis, metric='haversine')
+        hits = tree.query_radius(rows, r=rng / R)
+        return np.fromiter((h.size > 0 for h in hits), dtype=bool, count=lo_lat.shape[0])
+
+    if njit is not None:
+        return _vicinity_kernel(lo_lat, lo_lon, di_lat, di_lon, rng)
+
+    rng_deg = np.degrees(rng / R)
+    dlat_deg = di_lat[None, :] - lo_lat[:, None]
+    # Wrap the longitude delta to [-180, 180) so pairs straddling the
+    # antimeridian are not falsely rejected by the box test
+    dlon_deg = (di_lon[None, :] - lo_lon[:, None] + 180.0) % 360.0 - 180.0
+    box_mask = (np.abs(dlat_deg) <= rng_deg) & (np.abs(dlon_deg) * np.cos(np.radians(lo_lat))[:, None] <= rng_deg)
+
+    in_jeopardy = np.zeros(lo_lat.shape[0], dtype=bool)
+    li, dj = np.nonzero(box_mask)
+    if li.size:
+        phi1 = np.radians(lo_lat[li])
+        phi2 = np.radians(di_lat[dj])
+        delta_phi = phi2 - phi1
+        delta_lambda = np.radians(di_lon[dj] - lo_lon[li])
+        if ne is not None:
+            # numexpr multi-threads the elementwise math and skips temporaries
+            a = ne.evaluate('sin(delta_phi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(delta_lambda / 2) ** 2')
+        else:
+            a = np.sin(delta_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2) ** 2
+        distances = 2 * R * np.arcsin(np.sqrt(a))  # Distances in kilometers
+        in_jeopardy[li[distances <= rng]] = True
+    return in_jeopardy
+
+def _build_map_skeleton():
+    """Build the static map shell: tiles, CSS, control panel and refresh script.
+
+    The shell fragments are module constants, so per refresh this only
+    assembles pre-built strings onto a fresh folium.Map. Each refresh gets
+    its own Map: folium's save() deposits rendered fragments into the root
+    element keyed by child name, so reusing one live tree across refreshes
+    would accumulate every previously rendered marker layer in the HTML.
+    """
+    initial_location = [41.8719, 12.5674]  # Italy as the center of the map
+    company_map = folium.Map(location=initial_location, zoom_start=2)
+    root = company_map.get_root()
+    root.header.add_child(folium.Element(MARKERCLUSTER_ASSETS))
+    root.html.add_child(folium.Element(PULSATING_CSS))
+    root.html.add_child(folium.Element(SETTINGS_JS_TAG))
+    root.html.add_child(folium.Element(CONTROL_PANEL_HTML))
+    root.html.add_child(folium.Element(REFRESH_SCRIPT))
+    return company_map
+
+def _write_settings_js(disaster_range):
+    """Write the dynamic settings served to the browser alongside the map."""
+    with open('settings.js', 'w') as f:
+        f.write(f"var currentRefreshInterval = {get_refresh_interval()};\n"
+                f"var currentDisasterRange = {disaster_range};\n")
 
 def create_map_from_locations(locations_df, disasters_data, include_disasters=False, disaster_range=241):
     """Create a map showing locations and optionally disasters."""
     if locations_df.empty:
-        print("No location data available.")
+        log.warning("No location data available.")
         return None
 
-    initial_location = [41.8719, 12.5674]  # Italy as the center of the map
-    company_map = folium.Map(location=initial_location, zoom_start=2)
-
-    for _, row in locations_df.iterrows():
-        in_jeopardy = check_disaster_vicinity(row['Latitude'], row['Longitude'], disasters_data, disaster_range)
-        color = 'red' if in_jeopardy else 'blue'
-        folium.Marker(
-            location=[row['Latitude'], row['Longitude']],
-            popup=f"{row['Location_Name']}{' - In Jeopardy!' if in_jeopardy else ''}",
-            icon=folium.Icon(color=color)
-        ).add_to(company_map)
+    company_map = _build_map_skeleton()
+    marker_layer = folium.FeatureGroup(name='locations_and_disasters')
+
+    lo_lat = locations_df['Latitude'].to_numpy()
+    lo_lon = locations_df['Longitude'].to_numpy()
+    lo_name = locations_df['Location_Name'].to_numpy()
+
+    di_lat, di_lon = disaster_coordinate_arrays(disasters_data)
+    in_jeopardy_mask = check_disaster_vicinity(lo_lat, lo_lon, di_lat, di_lon, disaster_range)
+    log.info("%d of %d locations are within %s km of a disaster", int(in_jeopardy_mask.sum()), len(locations_df), disaster_range)
+
+    # Emit all location markers as one clustered Leaflet JS batch: a single
+    # Jinja fragment render instead of one folium Marker + Icon per row
+    marker_parts = []
+    for i in range(len(locations_df)):
+        in_jeopardy = bool(in_jeopardy_mask[i])
+        popup = f"{lo_name[i]}{' - In Jeopardy!' if in_jeopardy else ''}"
+        marker_parts.append(
+            f"L.marker([{lo_lat[i]},{lo_lon[i]}],{{icon:{('iconBlue', 'iconRed')[in_jeopardy]}}})"
+            f".bindPopup({json.dumps(popup)})"
+        )
+    marker_js = folium.Element(
+        f"var iconBlue = {ICON_BLUE_JS}, iconRed = {ICON_RED_JS};"
+        f"L.markerClusterGroup({{chunkedLoading: true}})"
+        f".addLayers([{','.join(marker_parts)}]).addTo({company_map.get_name()});"
+    )
+    company_map.get_root().script.add_child(marker_js)
 
     if include_disasters:
-        for disaster in disasters_data:
+        # One pass over the structured SoA array; marker and circle for each
+        # disaster land in the same FeatureGroup added once at the end
+        for rec in disasters_data:
+            location = [float(rec['lat']), float(rec['lon'])]
             folium.Marker(
-                location=disaster['coordinates'][::-1],
-                popup=f"Disaster: {disaster['name']} ({disaster['disaster_type']})",
+                location=location,
+                popup=f"Disaster: {rec['name']} ({rec['type']})",
                 icon=folium.Icon(color='orange')
-            ).add_to(company_map)
+            ).add_to(marker_layer)
 
             folium.Circle(
-                location=disaster['coordinates'][::-1],
+                location=location,
                 radius=disaster_range * 1000,  # Convert km to meters
                 color='orange',
                 fill=True,
                 fill_opacity=0.3,
-                id=f"disaster_circle_{disaster['name'].replace(' ', '_')}",  # Add an ID to the circle
+                id=f"disaster_circle_{rec['name'].replace(' ', '_')}",  # Add an ID to the circle
                 className='pulsating-circle'  # Add a class for styling
-            ).add_to(company_map)
-
-    # Add CSS for pulsating effect
-    pulsating_css = """
-    <style>
-    @keyframes pulse {
-        0% {
-            stroke-opacity: 0.8;
-            stroke-width: 1;
-        }
-        50% {
-            stroke-opacity: 0.3;
-            stroke-width: 3;
-        }
-        100% {
-            stroke-opacity: 0.8;
-            stroke-width: 1;
-        }
-    }
-    .pulsating-circle {
-        animation: pulse 2s ease-in-out infinite;
-    }
-    </style>
-    """
-    company_map.get_root().html.add_child(folium.Element(pulsating_css))
-
-    # Add current settings to the map
-    current_settings = f"""
-    <script>
-    var currentRefreshInterval = {get_refresh_interval()};
-    var currentDisasterRange = {disaster_range};
-    </script>
-    """
-    company_map.get_root().html.add_child(folium.Element(current_settings))
-
-    # Add dropdowns for refresh rate and disaster range selection, and progress bar
-    dropdowns_and_progress_html = """
-    <div id="control-panel" style="position: absolute; top: 10px; right: 10px; z-index: 1000; background: rgba(255, 255, 255, 0.7); padding: 10px; border-radius: 5px;">
-        <label for="refresh-rate">Refresh Rate:</label>
-        <select id="refresh-rate">
-            <option value="600">10 minutes</option>
-            <option value="3600" selected>1 hour</option>
-            <option value="21600">6 hours</option>
-            <option value="43200">12 hours</option>
-            <option value="86400">24 hours</option>
-        </select>
-        <br><br>
-        <label for="disaster-range">Disaster Range (km):</label>
-        <select id="disaster-range">
-            <option value="241" selected>241 (Default)</option>
-            <option value="300">300</option>
-            <option value="400">400</option>
-            <option value="500">500</option>
-            <option value="600">600</option>
-            <option value="700">700</option>
-            <option value="800">800</option>
-            <option value="900">900</option>
-            <option value="1000">1000</option>
-        </select>
-    </div>
-    <div id="progress-bar-container" style="position: fixed; bottom: 15px; left: 0; width: 100%; height: 10px; background-color: rgba(0, 0, 0, 0.1); z-index: 1000;">
-        <div id="progress-bar" style="width: 0%; height: 100%; background-color: rgba(0, 255, 0, 0.5);"></div>
-    </div>
-    """
-    company_map.get_root().html.add_child(folium.Element(dropdowns_and_progress_html))
-
-    # Add JavaScript for refresh functionality, disaster range update, progress bar, and heartbeat
-    refresh_script = """
-    <script>
-    var refreshInterval;
-    var progressInterval;
-    var startTime;
-    var duration;
-
-    function updateProgressBar() {
-        var currentTime = new Date().getTime();
-        var elapsedTime = currentTime - startTime;
-        var progress = (elapsedTime / duration) * 100;
-        document.getElementById('progress-bar').style.width = progress + '%';
-        
-        if (progress >= 100) {
-            clearInterval(progressInterval);
-        }
-    }
-
-    function setRefreshInterval() {
-        clearInterval(refreshInterval);
-        clearInterval(progressInterval);
-        
-        var refreshRate = document.getElementById('refresh-rate').value;
-        duration = refreshRate * 1000;
-        startTime = new Date().getTime();
-        
-        // Update the refresh_config.json file
-        fetch('http://localhost:8000/update_refresh_rate?interval=' + refreshRate)
-            .then(response => response.text())
-            .then(data => console.log(data))
-            .catch(error => console.error('Error:', error));
-
-        refreshInterval = setInterval(function() {
-            location.reload();
-        }, duration);
-        
-        progressInterval = setInterval(updateProgressBar, 1000); // Update progress every second
-        updateProgressBar(); // Initial update
-    }
+            ).add_to(marker_layer)
 
-    function updateDisasterRange() {
-        var disasterRange = document.getElementById('disaster-range').value;
-        fetch('http://localhost:8000/update_disaster_range?range=' + disasterRange)
-            .then(response => response.text())
-            .then(data => {
-                console.log(data);
-                location.reload();  // Reload the page to reflect the changes
-            })
-            .catch(error => console.error('Error:', error));
-    }
-
-    function sendHeartbeat() {
-        fetch('http://localhost:8000/heartbeat')
-            .then(response => response.text())
-            .catch(error => console.error('Error:', error));
-    }
-
-    // Send heartbeat every 5 seconds
-    setInterval(sendHeartbeat, 5000);
-
-    document.getElementById('refresh-rate').addEventListener('change', setRefreshInterval);
-    document.getElementById('disaster-range').addEventListener('change', updateDisasterRange);
-    setRefreshInterval();
-    </script>
-    """
-    company_map.get_root().html.add_child(folium.Element(refresh_script))
+    marker_layer.add_to(company_map)
 
+    _write_settings_js(disaster_range)
     map_path = 'updated_all_locations_map.html'
     company_map.save(map_path)
     return map_path
 
+# Structured layout for extracted disasters; the coordinate fields are the
+# SoA arrays the vicinity check consumes directly
+DISASTER_DTYPE = np.dtype([('name', 'U64'), ('type', 'U32'), ('lon', 'f4'), ('lat', 'f4')])
+
 def extract_disaster_info(disasters):
-    """Extract relevant information from disaster data."""
-    disaster_info = []
+    """Extract relevant disaster information into a structured NumPy array."""
+    rows = []
     for feature in disasters['features']:
-        properties = feature['properties']
-        name = properties.get('name', 'No Name Available')
-        disaster_type = properties.get('eventtype', 'Unknown')
-        geometry = feature['geometry']
-        coordinates = geometry.get('coordinates', [None, None])
-        disaster_info.append({
-            'name': name,
-            'disaster_type': disaster_type,
-            'coordinates': coordinates
-        })
-    return disaster_info
+        # Malformed features are skipped rather than aborting the update
+        p = feature.get('properties')
+        g = feature.get('geometry')
+        if not isinstance(p, dict) or not isinstance(g, dict):
+            continue
+        if not (g.get('coordinates')):
+            continue
+        rows.append((p.get('name', 'No Name Available'), p.get('eventtype', 'Unknown'),
+                     g['coordinates'][0], g['coordinates'][1]))
+    return np.array(rows, dtype=DISASTER_DTYPE)
+
+# Fingerprint of the inputs behind the last rendered map, used to skip
+# rebuilding (and the browser reload) when nothing changed
+_last_map_key = None
+_last_map_path = None
+
+# Serializes map refreshes: ThreadingHTTPServer handlers and the periodic
+# updater both call fetch_and_update_map, which updates the fingerprint
+# globals above and overwrites the saved map file
+_map_lock = threading.Lock()
+
+def _map_inputs_key(disaster_info, locations_df, disaster_range):
+    """Hash everything that affects the rendered map."""
+    return hashlib.blake2b(
+        disaster_info.tobytes()
+        + pd.util.hash_pandas_object(locations_df, index=False).values.tobytes()
+        + str(disaster_range).encode(),
+        digest_size=16
+    ).digest()
+
+
+# Shared GDACS client (keeps the underlying HTTP session alive) and the
+# last successfully parsed feed
+_gdacs_client = None
+_last_feed = None
+
+def _fetch_latest_events():
+    """Fetch the latest GDACS events through the shared client.
+
+    The gdacs client exposes no conditional-GET (ETag/If-Modified-Since)
+    hook, so the nearest equivalent is reusing one client across refreshes
+    and falling back to the last good payload when a fetch fails.
+    """
+    global _gdacs_client, _last_feed
+    if _gdacs_client is None:
+        _gdacs_client = GDACSAPIReader()
+    try:
+        _last_feed = vars(_gdacs_client.latest_events())
+    except Exception as e:
+        if _last_feed is None:
+            raise
+        log.warning("GDACS fetch failed (%s); reusing the last successful feed", e)
+    return _last_feed
 
 def fetch_and_update_map(csv_path, include_disasters=True):
     """Fetch the latest disaster data and update the map."""
-    try:
-        client = GDACSAPIReader()
-        disaster_data = client.latest_events()
-        disaster_data = vars(disaster_data)
-        disaster_info = extract_disaster_info(disaster_data)
-        locations_df = load_locations_from_csv(csv_path)
-        disaster_range = get_disaster_range()  # Get the current disaster range
-        map_path = create_map_from_locations(locations_df, disaster_info, include_disasters, disaster_range)
-        print(f"Map updated with the latest disaster data. Disaster range: {disaster_range} km")
-        return map_path
-    except Exception as e:
-        print(f"Error during fetching or processing: {e}")
-        return None
+    global _last_map_key, _last_map_path
+    with _map_lock:
+        try:
+            disaster_data = _fetch_latest_events()
+            disaster_info = extract_disaster_info(disaster_data)
+            locations_df = load_locations_from_csv(csv_path)
+            disaster_range = get_disaster_range()  # Get the current disaster range
+
+            key = _map_inputs_key(disaster_info, locations_df, disaster_range)
+            if key == _last_map_key and _last_map_path is not None:
+                log.info("Disaster data, locations and range unchanged; keeping the existing map")
+                return _last_map_path
+
+            map_path = create_map_from_locations(locations_df, disaster_info, include_disasters, disaster_range)
+            _last_map_key = key
+            _last_map_path = map_path
+            log.info("Map updated with the latest disaster data. Disaster range: %s km", disaster_range)
+            return map_path
+        except Exception:
+            log.exception("Error during fetching or processing")
+            return None
+
+CONFIG_PATH = 'refresh_config.json'
+
+# Parsed config cached in-process; mtime invalidates reads, writes are debounced
+_cfg_cache = {'mtime': 0, 'data': None}
+_cfg_flush_timer = None
+_cfg_lock = threading.Lock()
+
+def _get_config():
+    """Return the parsed config, re-reading only when the file changed on disk."""
+    mtime = os.path.getmtime(CONFIG_PATH)
+    if _cfg_cache['data'] is None or mtime != _cfg_cache['mtime']:
+        with open(CONFIG_PATH, 'r') as f:
+            _cfg_cache.update(mtime=mtime, data=json.load(f))
+    return _cfg_cache['data']
+
+def _flush_config():
+    """Write the in-memory config back to disk."""
+    global _cfg_flush_timer
+    with _cfg_lock:
+        _cfg_flush_timer = None
+        with open(CONFIG_PATH, 'w') as f:
+            json.dump(_cfg_cache['data'], f)
+        _cfg_cache['mtime'] = os.path.getmtime(CONFIG_PATH)
+
+def _update_config(key, value):
+    """Update the in-memory config and schedule a debounced disk write.
+
+    Rapid dropdown changes in the browser coalesce into one write instead
+    of a read-modify-write round trip per request.
+    """
+    global _cfg_flush_timer
+    _get_config()[key] = value
+    with _cfg_lock:
+        if _cfg_flush_timer is None:
+            _cfg_flush_timer = threading.Timer(0.5, _flush_config)
+            _cfg_flush_timer.daemon = True
+            _cfg_flush_timer.start()
 
 def get_refresh_interval():
-    with open('refresh_config.json', 'r') as f:
-        config = json.load(f)
-    return config['refresh_interval']
+    return _get_config()['refresh_interval']
 
 def update_refresh_interval(new_interval):
-    with open('refresh_config.json', 'r') as f:
-        config = json.load(f)
-    config['refresh_interval'] = new_interval
-    with open('refresh_config.json', 'w') as f:
-        json.dump(config, f)
+    _update_config('refresh_interval', new_interval)
 
 def get_disaster_range():
-    with open('refresh_config.json', 'r') as f:
-        config = json.load(f)
-    return config.get('disaster_range', 241)  # Default to 241 if not set
+    return _get_config().get('disaster_range', 241)  # Default to 241 if not set
 
 def update_disaster_range(new_range):
-    with open('refresh_config.json', 'r') as f:
-        config = json.load(f)
-    config['disaster_range'] = new_range
-    with open('refresh_config.json', 'w') as f:
-        json.dump(config, f)
+    _update_config('disaster_range', new_range)
 
 def update_map_periodically(csv_path, include_disasters=True):
     while True:
         interval = get_refresh_interval()
         map_path = fetch_and_update_map(csv_path, include_disasters)
-        print(f"Map updated at {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        log.info("Map updated at %s", time.strftime('%Y-%m-%d %H:%M:%S'))
         time.sleep(interval)
 
 class CustomHandler(SimpleHTTPRequestHandler):
@@ -306,10 +533,11 @@ class CustomHandler(SimpleHTTPRequestHandler):
             super().do_GET()
 
 def signal_handler(signum, frame):
-    print("Received signal to terminate. Shutting down...")
+    log.info("Received signal to terminate. Shutting down...")
     os._exit(0)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
     csv_path = 'locations.csv'
     initial_map_path = fetch_and_update_map(csv_path, include_disasters=True)
     
@@ -321,26 +549,37 @@ if __name__ == '__main__':
         update_thread.daemon = True
         update_thread.start()
         
-        print("Map is now open in your web browser. It will refresh automatically based on the selected interval.")
-        print("The map file will be updated based on the selected interval with new disaster data.")
-        print("You can keep this script running to continue updating the map file.")
+        log.info("Map is now open in your web browser. It will refresh automatically based on the selected interval.")
+        log.info("The map file will be updated based on the selected interval with new disaster data.")
+        log.info("You can keep this script running to continue updating the map file.")
         
         # Set up signal handler
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
-        
-        # Start a simple HTTP server to handle refresh rate updates and heartbeats
-        server = HTTPServer(('localhost', 8000), CustomHandler)
-        print("Starting server at http://localhost:8000")
-        
-        # Set up a timer to check for heartbeats
+
+        # Start a threaded HTTP server to handle refresh rate updates and
+        # heartbeats concurrently instead of one request at a time
+        server = ThreadingHTTPServer(('localhost', 8000), CustomHandler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        log.info("Starting server at http://localhost:8000")
+
+        # Watchdog: shut down once the browser stops sending heartbeats,
+        # checked on its own timer rather than between requests
         global last_heartbeat
         last_heartbeat = time.time()
-        
-        while True:
-            server.handle_request()
-            if time.time() - last_heartbeat > 30:  # Increase timeout to 30 seconds
-                print("No heartbeat received. Assuming browser window closed. Shutting down...")
-                break
-        
+        shutdown_event = threading.Event()
+
+        def check_heartbeat():
+            if time.time() - last_heartbeat > 30:  # 30 second timeout
+                log.info("No heartbeat received. Assuming browser window closed. Shutting down...")
+                server.shutdown()
+                shutdown_event.set()
+            else:
+                timer = threading.Timer(5, check_heartbeat)
+                timer.daemon = True
+                timer.start()
+
+        check_heartbeat()
+        shutdown_event.wait()
         os._exit(0)
\ No newline at end of file
@@ -1,9 +1,18 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from gdacs.api import GDACSAPIReader
 import folium
-from streamlit_folium import st_folium
+from folium.plugins import FastMarkerCluster
+import streamlit.components.v1 as components
 from datetime import datetime, timedelta
+from dataclasses import dataclass
+import hashlib
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; folium's stdlib json path is used instead
+    orjson = None
 
 ALERT_LEVELS = {
     'RED': 'Critical',
@@ -22,126 +31,296 @@ ALERT_COLORS = {
     'Inactive': 'gray'
 }
 
-def normalize_alert_level(raw_level):
-    """Convert raw API alert level to normalized value."""
-    if not raw_level:
-        return 'Unknown'
-    return ALERT_LEVELS.get(raw_level.upper(), 'Unknown')
+# Integer codes for the normalized alert levels; code 5 is the effective
+# "Inactive" status applied when a disaster is no longer current
+ALERT_CODES = {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3, 'Unknown': 4}
+STATUS_NAMES = np.array(['Critical', 'High', 'Medium', 'Low', 'Unknown', 'Inactive'], dtype=object)
+COLOR_LUT = np.array([ALERT_COLORS[s] for s in STATUS_NAMES], dtype=object)
 
-def extract_disaster_info(disasters):
-    """Extract relevant information from disaster data."""
-    disaster_info = []
-    try:
-        for feature in disasters['features']:
-            try:
-                properties = feature.get('properties', {})
-                geometry = feature.get('geometry', {})
-                coords = geometry.get('coordinates', [])
-                
-                # Get the date information and current status
-                is_current = properties.get('iscurrent', 'false').lower() == 'true'
-                raw_alert = properties.get('alertlevel')
-                normalized_alert = normalize_alert_level(raw_alert)
-                
-                # Handle coordinates
-                if isinstance(coords, (list, tuple)):
-                    try:
-                        if len(coords) >= 2:
-                            coordinates = [float(coords[0]), float(coords[1])]
-                        else:
-                            continue
-                    except (ValueError, TypeError):
-                        continue
-                else:
-                    continue
-                
-                disaster_info.append({
-                    'name': properties.get('name', 'No Name Available'),
-                    'disaster_type': properties.get('eventtype', 'Unknown'),
-                    'coordinates': coordinates,
-                    'alert_level': normalized_alert,
-                    'is_current': is_current
-                })
-            except Exception as e:
-                continue
-        
-        return disaster_info
-    except Exception as e:
-        st.error(f"Error in extract_disaster_info: {str(e)}")
-        return []
+# Above this many features the map switches to client-side clustering so
+# Leaflet never has to add thousands of individual layers in one pass
+CLUSTER_THRESHOLD = 500
+
+# Leaflet layer for the pre-serialized FeatureCollection; matches the
+# CircleMarker styling and popup of the folium.GeoJson fallback
+_GEOJSON_SCRIPT = """
+L.geoJson(%(fc)s, {
+    pointToLayer: function (feature, latlng) {
+        return L.circleMarker(latlng, {
+            radius: 5, color: feature.properties.color,
+            fillColor: feature.properties.color, weight: 1, fillOpacity: 0.8
+        });
+    },
+    onEachFeature: function (feature, layer) {
+        layer.bindPopup('Name: ' + feature.properties.name +
+                        '<br>Type: ' + feature.properties.type +
+                        '<br>Alert Level: ' + feature.properties.alert);
+    }
+}).addTo(%(map)s);
+"""
+
+# FastMarkerCluster callback: rows arrive as [lat, lon, color, name, type, alert];
+# the popup matches the non-clustered paths
+_CLUSTER_CALLBACK = """
+function (row) {
+    return L.circleMarker([row[0], row[1]], {
+        radius: 5, color: row[2], fillColor: row[2], weight: 1, fillOpacity: 0.8
+    }).bindPopup('Name: ' + row[3] + '<br>Type: ' + row[4] +
+                 '<br>Alert Level: ' + row[5]);
+}
+"""
+
+@dataclass(frozen=True)
+class Disasters:
+    """Column-oriented (struct-of-arrays) view of the extracted disaster feed."""
+    names: np.ndarray
+    types: np.ndarray
+    lats: np.ndarray
+    lons: np.ndarray
+    codes: np.ndarray  # int8 indexes into STATUS_NAMES / COLOR_LUT
+    is_current: np.ndarray
+
+    def __len__(self):
+        return self.names.shape[0]
+
+    @classmethod
+    def empty(cls):
+        return cls(names=np.empty(0, dtype=object), types=np.empty(0, dtype=object),
+                   lats=np.empty(0), lons=np.empty(0),
+                   codes=np.empty(0, dtype=np.int8), is_current=np.empty(0, dtype=bool))
+
+    def labels(self):
+        """Display labels ("name (type)"), built in one vectorized concat."""
+        names = self.names.astype(str)
+        types = self.types.astype(str)
+        return np.char.add(np.char.add(names, ' ('), np.char.add(types, ')'))
+
+    def fingerprint(self):
+        """Content digest over every column, used as a rerun cache key."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.lats.tobytes())
+        h.update(self.lons.tobytes())
+        h.update(self.codes.tobytes())
+        h.update(self.is_current.tobytes())
+        h.update('\x1f'.join(map(str, self.names)).encode())
+        h.update('\x1f'.join(map(str, self.types)).encode())
+        return h.hexdigest()
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_disasters(days_back=7, alert_level=None, disaster_type=None):
+    """Fetch, filter and extract disasters in one pass over one DataFrame.
+
+    The raw feed is normalized once; the date, alert-level and event-type
+    filters are combined into a single boolean mask applied before the SoA
+    is materialized, so no intermediate feature lists are built. Cached so
+    a rerun with the same filters (radio click) skips the whole pipeline;
+    the ttl matches _fetch_raw_events so an expired feed (and the
+    datetime.now() cutoff below) is re-evaluated rather than served
+    forever. Returns (Disasters, total unfiltered feature count).
+    """
+    features = _fetch_raw_events().get('features', [])
+    total = len(features)
+    if not features:
+        return Disasters.empty(), total
+
+    df = pd.json_normalize(features, sep='_')
+    if 'geometry_coordinates' not in df.columns:
+        return Disasters.empty(), total
+
+    # Normalize alert level column-wise; the str accessor and map run
+    # in C instead of one Python call per row
+    raw_alerts = df.get('properties_alertlevel', pd.Series(index=df.index, dtype=object))
+    alerts = raw_alerts.astype('string').str.upper().map(ALERT_LEVELS).fillna('Unknown')
+
+    keep = pd.Series(True, index=df.index)
+    if days_back:
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        dates = df.get('properties_fromdate', pd.Series(index=df.index, dtype=object))
+        parsed = pd.to_datetime(dates.astype(str).str[:10], format='%Y-%m-%d', errors='coerce')
+        keep &= parsed >= cutoff_date
+    if alert_level and alert_level != 'All':
+        keep &= alerts == alert_level
+    if disaster_type:
+        types_raw = df.get('properties_eventtype', pd.Series(index=df.index, dtype=object))
+        keep &= types_raw.astype(str).str.lower() == disaster_type.lower()
+    df = df[keep]
+    alerts = alerts[keep]
+
+    df_valid = df.dropna(subset=['geometry_coordinates'])
+    df_valid = df_valid[df_valid['geometry_coordinates'].map(lambda c: isinstance(c, (list, tuple)))]
+    if df_valid.empty:
+        return Disasters.empty(), total
+    alerts = alerts.loc[df_valid.index]
+
+    # Coerce the first two coordinate entries to numbers; anything
+    # short, non-numeric or non-finite falls out of the mask
+    coords_df = pd.DataFrame(df_valid['geometry_coordinates'].tolist(), index=df_valid.index)
+    if coords_df.shape[1] < 2:
+        return Disasters.empty(), total
+    coords = coords_df.iloc[:, :2].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    mask = np.isfinite(coords).all(axis=1)
+    df_valid = df_valid[mask]
+    coords = coords[mask]
+    alerts = alerts[mask]
+    # 6 decimals is ~10 cm on the ground; trimming here keeps the
+    # serialized FeatureCollection and map HTML from carrying 15-digit
+    # floats per coordinate
+    coords = np.round(coords, 6)
+
+    names = df_valid.get('properties_name', pd.Series(index=df_valid.index, dtype=object)).fillna('No Name Available')
+    types = df_valid.get('properties_eventtype', pd.Series(index=df_valid.index, dtype=object)).fillna('Unknown')
+    is_current = df_valid.get('properties_iscurrent', pd.Series(index=df_valid.index, dtype=object)).astype(str).str.lower() == 'true'
+
+    return Disasters(
+        names=names.to_numpy(dtype=object),
+        types=types.to_numpy(dtype=object),
+        lats=coords[:, 1].copy(),
+        lons=coords[:, 0].copy(),
+        codes=alerts.map(ALERT_CODES).fillna(ALERT_CODES['Unknown']).to_numpy(dtype=np.int8),
+        is_current=is_current.to_numpy(dtype=bool)
+    ), total
 
 def calculate_bounds(disasters_data):
-    """Calculate the bounds that encompass all disasters."""
+    """Calculate the bounds that encompass all disasters.
+
+    Deliberately uncached: the vectorized reductions are cheaper than
+    hashing the arrays for a cache lookup would be.
+    """
     try:
-        if not disasters_data:
+        if disasters_data is None or len(disasters_data) == 0:
             return None
-        
-        # Filter out any invalid coordinates
-        valid_disasters = [d for d in disasters_data if isinstance(d.get('coordinates'), (list, tuple)) 
-                         and len(d['coordinates']) >= 2 
-                         and all(isinstance(x, (int, float)) for x in d['coordinates'][:2])]
-        
-        if not valid_disasters:
-            return None
-            
-        lats = [d['coordinates'][1] for d in valid_disasters]
-        lons = [d['coordinates'][0] for d in valid_disasters]
-        return [[min(lats), min(lons)], [max(lats), max(lons)]]
+
+        # Coordinates are already validated at extract time; bounds are
+        # two C-level reductions over the coordinate columns
+        return [[float(disasters_data.lats.min()), float(disasters_data.lons.min())],
+                [float(disasters_data.lats.max()), float(disasters_data.lons.max())]]
     except Exception as e:
         st.error(f"Error calculating bounds: {str(e)}")
         return None
 
-def get_marker_color(alert_level, is_current):
-    """Determine marker color based on normalized alert level and current status."""
-    if not is_current:
-        return ALERT_COLORS['Inactive']
-    return ALERT_COLORS.get(alert_level, ALERT_COLORS['Unknown'])
+def _feature_collection(disasters_data):
+    """Build a GeoJSON FeatureCollection and the per-status marker counts.
+
+    Properties are deliberately limited to the four fields the popup and
+    style function read (name, type, alert, color); none of the other
+    GDACS feed properties reach the serialized payload or Leaflet's
+    per-feature memory.
+    """
+    # One vectorized gather per column instead of a dict lookup and an
+    # Inactive branch per marker; bincount replaces the Python counting loop
+    codes_eff = np.where(disasters_data.is_current, disasters_data.codes, 5)
+    statuses = STATUS_NAMES[codes_eff]
+    colors = COLOR_LUT[codes_eff]
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point',
+                         'coordinates': [float(disasters_data.lons[i]), float(disasters_data.lats[i])]},
+            'properties': {
+                'name': str(disasters_data.names[i]),
+                'type': str(disasters_data.types[i]),
+                'alert': statuses[i],
+                'color': colors[i]
+            }
+        }
+        for i in range(len(disasters_data))
+    ]
+    bins = np.bincount(codes_eff, minlength=len(STATUS_NAMES))
+    counts = {STATUS_NAMES[c]: int(n) for c, n in enumerate(bins) if n}
+    return {'type': 'FeatureCollection', 'features': features}, counts
+
+@st.cache_data(show_spinner=False)
+def _build_map_html(_disasters_data, fingerprint, selected_idx, bounds_tuple):
+    """Build the folium map and render it to HTML, cached across reruns.
+
+    The leading underscore excludes the Disasters arrays from Streamlit's
+    argument hashing (object-dtype arrays hash by pointer, which would
+    change on every unpickled copy); the content fingerprint passed
+    alongside is the real cache key. Reruns that leave the dataset,
+    selection and bounds unchanged get the rendered HTML back without
+    re-running folium's templating. Returns (html, marker_counts).
+    """
+    # Set center coordinates and zoom level
+    if selected_idx is not None:
+        center_lat = float(_disasters_data.lats[selected_idx])
+        center_lon = float(_disasters_data.lons[selected_idx])
+        zoom_level = 8  # Closer zoom for selected disaster
+    else:
+        center_lat, center_lon = 0, 0
+        zoom_level = 2  # World view for all disasters
+
+    # prefer_canvas draws the CircleMarkers onto one canvas element
+    # instead of one DOM node per marker, which keeps pan/zoom smooth
+    # well past the point where per-node layout breaks down
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=zoom_level,
+                   prefer_canvas=True)
+
+    # One GeoJson layer bound to a FeatureCollection instead of one
+    # folium.Marker per disaster: Leaflet consumes the features in a
+    # single JS loop and the generated HTML stays compact
+    fc, marker_counts = _feature_collection(_disasters_data)
+    if len(_disasters_data) > CLUSTER_THRESHOLD:
+        # Large feeds go through the markercluster plugin, which adds
+        # layers in chunks and keeps the main thread responsive
+        FastMarkerCluster(
+            data=[[f['geometry']['coordinates'][1], f['geometry']['coordinates'][0],
+                   f['properties']['color'], f['properties']['name'],
+                   f['properties']['type'], f['properties']['alert']]
+                  for f in fc['features']],
+            callback=_CLUSTER_CALLBACK
+        ).add_to(m)
+    elif orjson is not None:
+        # Pre-serialize with orjson and hand Leaflet the finished string;
+        # this skips folium's GeoJson class and its stdlib json.dumps of
+        # the whole FeatureCollection inside the Jinja template
+        m.get_root().script.add_child(folium.Element(
+            _GEOJSON_SCRIPT % {'map': m.get_name(), 'fc': orjson.dumps(fc).decode()}
+        ))
+    else:
+        folium.GeoJson(
+            fc,
+            marker=folium.CircleMarker(radius=5),
+            style_function=lambda f: {
+                'fillColor': f['properties']['color'],
+                'color': f['properties']['color'],
+                'weight': 1,
+                'fillOpacity': 0.8
+            },
+            popup=folium.GeoJsonPopup(fields=['name', 'type', 'alert'],
+                                      aliases=['Name', 'Type', 'Alert Level'])
+        ).add_to(m)
+
+    # Handle bounds and zoom
+    if bounds_tuple:
+        m.fit_bounds([list(b) for b in bounds_tuple])
+    elif selected_idx is not None:  # If a single disaster is selected, ensure proper zoom
+        m.location = [center_lat, center_lon]
+        m.zoom_start = zoom_level
+
+    return m.get_root().render(), marker_counts
 
-def create_map(disasters_data, selected_disaster=None, fit_bounds=None):
+def create_map(disasters_data, selected_idx=None, fit_bounds=None):
     """Create map with disaster markers."""
     try:
         # Verify data before creating map
-        if not disasters_data:
+        if disasters_data is None or len(disasters_data) == 0:
             st.warning("No valid disaster data to display")
             return
-            
-        # Set center coordinates and zoom level
-        if selected_disaster and isinstance(selected_disaster.get('coordinates'), (list, tuple)):
-            center_coords = selected_disaster['coordinates']
-            center_lat, center_lon = float(center_coords[1]), float(center_coords[0])
-            zoom_level = 8  # Closer zoom for selected disaster
+
+        bounds_tuple = tuple(tuple(b) for b in fit_bounds) if fit_bounds else None
+
+        # Content-based short-circuit: a matching fingerprint means the
+        # last rendered HTML can be re-displayed without paying folium's
+        # templating or the cache_data lookup again
+        fingerprint = disasters_data.fingerprint()
+        map_key = (fingerprint, selected_idx, bounds_tuple)
+        if st.session_state.get('last_map_key') == map_key:
+            html, marker_counts = st.session_state['last_map_render']
         else:
-            center_lat, center_lon = 0, 0
-            zoom_level = 2  # World view for all disasters
-            
-        m = folium.Map(location=[center_lat, center_lon], zoom_start=zoom_level)
-        
-        # Add markers with color legend
-        marker_counts = {'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Inactive': 0}
-        
-        for disaster in disasters_data:
-            try:
-                coords = disaster['coordinates']
-                if not isinstance(coords, (list, tuple)) or len(coords) < 2:
-                    continue
-                    
-                lat, lon = float(coords[1]), float(coords[0])
-                # Set color based on alert level and current status
-                alert_status = 'Inactive' if not disaster['is_current'] else disaster['alert_level']
-                marker_color = ALERT_COLORS.get(alert_status, ALERT_COLORS['Unknown'])
-                
-                folium.Marker(
-                    [lat, lon],
-                    popup=f"{disaster['name']} ({disaster['disaster_type']})<br>Alert Level: {alert_status}",
-                    icon=folium.Icon(color=marker_color, icon='info-sign')
-                ).add_to(m)
-                
-                marker_counts[alert_status] = marker_counts.get(alert_status, 0) + 1
-                
-            except Exception as e:
-                st.warning(f"Error adding marker: {str(e)}")
-                continue
-        
+            html, marker_counts = _build_map_html(disasters_data, fingerprint, selected_idx, bounds_tuple)
+            st.session_state['last_map_key'] = map_key
+            st.session_state['last_map_render'] = (html, marker_counts)
+
         # Add legend text above the map
         legend_text = " | ".join([
             f"{level}: {count} ({ALERT_COLORS[level]} marker{'s' if count != 1 else ''})"
@@ -149,172 +328,127 @@ def create_map(disasters_data, selected_disaster=None, fit_bounds=None):
             if count > 0
         ])
         st.markdown(f"**Legend:** {legend_text}")
-        
-        # Handle bounds and zoom
-        if fit_bounds:
-            m.fit_bounds(fit_bounds)
-        elif selected_disaster:  # If a single disaster is selected, ensure proper zoom
-            m.location = [center_lat, center_lon]
-            m.zoom_start = zoom_level
-        
-        st_folium(m, width='100%', height=950, returned_objects=[], use_container_width=True)
-        
+
+        # The map is static output (returned_objects was already []), so
+        # the cached HTML can go straight into an iframe
+        components.html(html, height=950, scrolling=False)
+
     except Exception as e:
         st.error(f"Error creating map: {str(e)}")
 
-def fetch_disaster_data(days_back=7, limit=None, min_alert_level=None):
-    """Fetch disaster data with configurable parameters"""
-    try:
-        client = GDACSAPIReader()
-        disasters = client.latest_events()
-        
-        # Handle Pydantic GeoJSON object
-        if hasattr(disasters, 'model_dump'):
-            disasters = disasters.model_dump()
-        
-        # Convert to standard format if needed
-        if not isinstance(disasters, dict):
-            return {'features': []}
-        
-        features = disasters.get('features', [])
-        
-        # Filter by date if days_back is specified
-        if days_back:
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            filtered_features = []
-            
-            for feature in features:
-                try:
-                    props = feature.get('properties', {})
-                    date_str = props.get('fromdate', '').split('T')[0]
-                    event_date = datetime.strptime(date_str, '%Y-%m-%d')
-                    if event_date >= cutoff_date:
-                        filtered_features.append(feature)
-                except (KeyError, ValueError, TypeError) as e:
-                    continue
-            
-            features = filtered_features
-        
-        return {'features': features}
-        
-    except Exception as e:
-        st.error(f"Error fetching disaster data: {str(e)}")
-        return {'features': []}
-
-def get_filtered_disasters(days_back=7, alert_level=None, disaster_type=None):
-    disasters = fetch_disaster_data(days_back=days_back, limit=None)
-    
-    if not disasters or 'features' not in disasters:
-        st.warning("No disaster data available")
-        return {'features': []}
-    
-    filtered_disasters = []
-    for disaster in disasters['features']:
-        if isinstance(disaster, dict) and 'properties' in disaster:
-            properties = disaster['properties']
-            
-            # Normalize the alert level from the API before comparison
-            current_alert = normalize_alert_level(properties.get('alertlevel'))
-            
-            # Check if we should filter by alert level
-            if alert_level and alert_level != "All":
-                if current_alert != alert_level:
-                    continue
-            
-            # Check if we should filter by disaster type
-            if disaster_type:
-                current_type = properties.get('eventtype', '').lower()
-                if current_type != disaster_type.lower():
-                    continue
-            
-            filtered_disasters.append(disaster)
-    
-    # Show summary statistics
-    total = len(disasters['features'])
-    filtered = len(filtered_disasters)
-    if alert_level or disaster_type:
-        st.info(f"Showing {filtered} of {total} disasters matching your filters")
-    else:
-        st.info(f"Showing all {total} disasters")
-    
-    return {'features': filtered_disasters}
+@st.cache_resource
+def _get_gdacs_client():
+    """Shared GDACS client so the HTTP session survives Streamlit reruns."""
+    return GDACSAPIReader()
 
-def main():
-    st.set_page_config(layout="wide")
-    
-    if 'show_all' not in st.session_state:
-        st.session_state.show_all = True
-    if 'last_refresh' not in st.session_state:
-        st.session_state.last_refresh = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Add sidebar filters
+@st.cache_data(ttl=600, persist="disk", show_spinner=False)
+def _fetch_raw_events():
+    """Download and normalize the latest GDACS events, cached across reruns.
+
+    persist="disk" keeps the last payload across server restarts, so the
+    first request after a redeploy serves from disk instead of paying the
+    GDACS HTTP round trip.
+    """
+    disasters = _get_gdacs_client().latest_events()
+
+    # Handle Pydantic GeoJSON object
+    if hasattr(disasters, 'model_dump'):
+        disasters = disasters.model_dump()
+
+    if not isinstance(disasters, dict) or 'features' not in disasters:
+        # Raise instead of returning so a corrupt payload never poisons the cache
+        raise ValueError("GDACS response missing 'features'")
+    return disasters
+
+def render_filter_sidebar():
+    """Render the filter widgets; pure UI, returns the chosen filters."""
     st.sidebar.header("Filter Disasters")
     days_back = st.sidebar.slider("Days to look back", 1, 30, 7)
-    
+
     # Update the alert level options to include "All"
     alert_level = st.sidebar.selectbox(
         "Alert Level",
         options=["All", "Critical", "High", "Medium", "Low"],
         format_func=lambda x: x
     )
-    
-    # Pass None instead of "All" to the filter function
-    alert_level_filter = None if alert_level == "All" else alert_level
-    
+
     disaster_type = st.sidebar.selectbox(
         "Disaster Type",
         options=[None, "EQ", "TC", "FL", "VO"],
         format_func=lambda x: "All" if x is None else x
     )
-    
+
+    # Pass None instead of "All" to the loader
+    return days_back, None if alert_level == "All" else alert_level, disaster_type
+
+def render_disaster_list(disaster_info):
+    """Render the disaster-list radio; returns the selected index or None."""
+    labels = disaster_info.labels().tolist()
+    label_to_idx = {lbl: i for i, lbl in enumerate(labels)}
+    with st.sidebar.container():
+        st.sidebar.header("Disaster List")
+        # Add "All Disasters" option to the start of the list
+        options = ["All Disasters"] + labels
+        selected_name = st.sidebar.radio(
+            "Select a disaster to zoom:",
+            options=options,
+            key="disaster_selector"
+        )
+
+    if selected_name == "All Disasters":
+        st.session_state.show_all = True
+        return None
+    st.session_state.show_all = False
+    return label_to_idx.get(selected_name) if selected_name else None
+
+def render_header(event_count):
+    """Render the title row and the Refresh button.
+
+    The Refresh button is the only control path that re-downloads data;
+    every other interaction resolves against the caches.
+    """
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.markdown(f"<h2 style='margin-bottom:0px'>Worldwide Disaster Mapping ({event_count} Events)</h2>", unsafe_allow_html=True)
+    with col2:
+        if st.button("Refresh Data"):
+            _fetch_raw_events.clear()  # Force a fresh download on the rerun
+            load_disasters.clear()
+            st.session_state.last_refresh = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            st.rerun()
+        st.markdown(f"<p style='font-size: 10px;'>Last refreshed: {st.session_state.last_refresh}</p>", unsafe_allow_html=True)
+
+def main():
+    st.set_page_config(layout="wide")
+
+    if 'show_all' not in st.session_state:
+        st.session_state.show_all = True
+    if 'last_refresh' not in st.session_state:
+        st.session_state.last_refresh = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    days_back, alert_level_filter, disaster_type = render_filter_sidebar()
+
     try:
-        # Get filtered disaster data with corrected alert level
-        disasters = get_filtered_disasters(
+        # Fetch, filter and extract in one fused, cached pass
+        disaster_info, total = load_disasters(
             days_back=days_back,
             alert_level=alert_level_filter,
             disaster_type=disaster_type
         )
-        disaster_info = extract_disaster_info(disasters)
-        
-        # Create two columns for title and button
-        col1, col2 = st.columns([4, 1])
-        with col1:
-            st.markdown(f"<h2 style='margin-bottom:0px'>Worldwide Disaster Mapping ({len(disaster_info)} Events)</h2>", unsafe_allow_html=True)
-        with col2:
-            if st.button("Refresh Data"):
-                st.session_state.last_refresh = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                st.rerun()
-            st.markdown(f"<p style='font-size: 10px;'>Last refreshed: {st.session_state.last_refresh}</p>", unsafe_allow_html=True)
-
-        # Create sidebar with reduced width
-        with st.sidebar.container():
-            st.sidebar.header("Disaster List")
-            # Add "All Disasters" option to the start of the list
-            options = ["All Disasters"] + [f"{d['name']} ({d['disaster_type']})" for d in disaster_info]
-            selected_name = st.sidebar.radio(
-                "Select a disaster to zoom:",
-                options=options,
-                key="disaster_selector"
-            )
-
-        # Find selected disaster and manage state
-        selected_disaster = None
-        if selected_name == "All Disasters":
-            st.session_state.show_all = True
+        if alert_level_filter or disaster_type:
+            st.info(f"Showing {len(disaster_info)} of {total} disasters matching your filters")
         else:
-            st.session_state.show_all = False
-            if selected_name:
-                selected_disaster = next(
-                    (d for d in disaster_info if f"{d['name']} ({d['disaster_type']})" == selected_name),
-                    None
-                )
+            st.info(f"Showing all {total} disasters")
+
+        render_header(len(disaster_info))
+        selected_idx = render_disaster_list(disaster_info)
 
         bounds = calculate_bounds(disaster_info)
-        
+
         # Create map using state to determine zoom
         create_map(
             disaster_info,
-            selected_disaster,
+            selected_idx,
             fit_bounds=bounds if st.session_state.show_all else None
         )
 